@@ -11,6 +11,7 @@ import time
 import json
 import logging
 import csv
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from decimal import Decimal
@@ -19,7 +20,9 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException, Timeout
+from urllib3.util.retry import Retry
 from binance.client import Client
 from dotenv import load_dotenv
 from colorama import Fore, Style, init as colorama_init
@@ -615,16 +618,70 @@ def record_iteration_message(text: str) -> None:
     if current_iteration_messages is not None:
         current_iteration_messages.append(strip_ansi_codes(text).rstrip())
 
+telegram_session: Optional[requests.Session] = None
+telegram_executor: Optional[ThreadPoolExecutor] = None
+
+def get_telegram_session() -> requests.Session:
+    """Return the shared Telegram HTTP session, creating it on first use.
+
+    Reusing one session keeps the TLS connection to api.telegram.org alive
+    between notifications instead of handshaking for every message.
+    """
+    global telegram_session
+
+    if telegram_session is None:
+        # sendMessage is not idempotent: a read timeout or a 500/502/504 from
+        # Telegram's proxy may follow a delivered message, so only connect
+        # errors and replies that mean it was not accepted are retried.
+        retries = Retry(
+            total=2,
+            read=0,
+            backoff_factor=0.2,
+            status_forcelist=(429, 503),
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,  # hand the last response back to the caller
+        )
+        session = requests.Session()
+        session.mount(
+            "https://api.telegram.org/",
+            HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retries),
+        )
+        telegram_session = session
+    return telegram_session
+
 def send_telegram_message(text: str, chat_id: Optional[str] = None, parse_mode: Optional[str] = "Markdown") -> None:
     """Send a notification message to Telegram if credentials are configured.
 
     If `chat_id` is provided it will be used; otherwise `TELEGRAM_CHAT_ID` is used.
     This allows sending different message types to a dedicated signals group (`TELEGRAM_SIGNALS_CHAT_ID`).
+
+    The request runs on a single background worker, so the trading loop does not
+    wait on Telegram; messages are still delivered in the order they were sent,
+    and pending ones are flushed before the interpreter exits unless
+    `shutdown_telegram_sender` dropped them first.
     """
+    global telegram_executor
+
     effective_chat = (chat_id or TELEGRAM_CHAT_ID or "").strip()
     if not TELEGRAM_BOT_TOKEN or not effective_chat:
         return
 
+    if telegram_executor is None:
+        telegram_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="telegram")
+    telegram_executor.submit(_post_telegram_message, text, effective_chat, parse_mode)
+
+def shutdown_telegram_sender() -> None:
+    """Drop queued Telegram messages so an interrupted bot exits promptly.
+
+    Only a request already in flight is waited for at exit, bounded by its
+    timeout; without this an unreachable Telegram would hold the shutdown
+    until every queued message had timed out.
+    """
+    if telegram_executor is not None:
+        telegram_executor.shutdown(wait=False, cancel_futures=True)
+
+def _post_telegram_message(text: str, effective_chat: str, parse_mode: Optional[str]) -> None:
+    """Deliver one Telegram message, retrying as plain text if Markdown is rejected."""
     try:
         payload = {
             "chat_id": effective_chat,
@@ -633,7 +690,8 @@ def send_telegram_message(text: str, chat_id: Optional[str] = None, parse_mode:
         if parse_mode:
             payload["parse_mode"] = parse_mode
         
-        response = requests.post(
+        session = get_telegram_session()
+        response = session.post(
             f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage",
             json=payload,
             timeout=10,
@@ -657,7 +715,7 @@ def send_telegram_message(text: str, chat_id: Optional[str] = None, parse_mode:
                 "text": strip_ansi_codes(text),
             }
             try:
-                fallback_response = requests.post(
+                fallback_response = session.post(
                     f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage",
                     json=fallback_payload,
                     timeout=10,
@@ -2535,6 +2593,7 @@ def main() -> None:
         except KeyboardInterrupt:
             print("\n\nShutting down bot...")
             save_state()
+            shutdown_telegram_sender()
             break
         except Exception as e:
             logging.error(f"Error in main loop: {e}", exc_info=True)
@@ -4,26 +4,82 @@
 The script reads the CSV/JSON artifacts under ``replay/data`` and emits a
 standalone ``index.html`` that visualizes the portfolio curve and trade events.
 It purposefully avoids heavy dependencies (such as pandas) so it can run inside
-the lightweight Codex environment or any vanilla Python installation.
+the lightweight Codex environment or any vanilla Python installation. When
+``orjson`` happens to be installed it is used to speed up JSON parsing and
+encoding.
 """
 
 from __future__ import annotations
 
 import argparse
+import base64
 import csv
+import gzip
+import io
 import json
+import re
+import sys
+from array import array
 from bisect import bisect_right
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from math import isfinite
+from operator import attrgetter, le
 from pathlib import Path
-from textwrap import dedent
-from typing import List, Sequence
+from string import Template
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, TextIO
+
+try:  # Optional accelerator; the stdlib encoder is used when it is missing.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the local environment
+    orjson = None
 
 DEFAULT_DATA_DIR = Path(__file__).parent / "data"
 DEFAULT_OUTPUT_FILE = Path(__file__).parent / "index.html"
-
-
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Columns the builders read as numbers; they are parsed once at load time.
+NUMERIC_COLUMNS = frozenset(
+    {
+        "total_balance",
+        "total_equity",
+        "total_return_pct",
+        "num_positions",
+        "btc_price",
+        "price",
+        "quantity",
+        "pnl",
+        "balance_after",
+        "profit_target",
+        "stop_loss",
+        "leverage",
+        "confidence",
+    }
+)
+
+# The chart draws between one and two times this many points of each line,
+# about twice the width of a wide chart, whatever part of a long session is
+# visible; the slider still steps through every snapshot.
+CHART_POINT_BUDGET = 3000
+
+# Template placeholders where the payloads are streamed instead of substituted.
+PAYLOAD_SLOTS = (
+    "portfolio_payload",
+    "trade_payload",
+    "trade_times",
+    "trade_values",
+    "completed_payload",
+    "completed_markers",
+)
+
+
+# Portfolio snapshots and trades share bar timestamps, so repeated strings are
+# parsed once. Returned datetimes are immutable and safe to share.
+@lru_cache(maxsize=1 << 16)
 def parse_timestamp(value: str) -> datetime:
     value = value.strip()
     if not value:
@@ -33,6 +89,25 @@ def parse_timestamp(value: str) -> datetime:
     return datetime.fromisoformat(value)
 
 
+def epoch_micros(dt: datetime) -> int:
+    """Integer sort key for ``dt``; naive timestamps are treated as UTC."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - EPOCH) // ONE_MICROSECOND
+
+
+def parse_timestamp_column(values: Sequence) -> List[datetime | None]:
+    """Parse a whole timestamp column; empty cells map to ``None``."""
+    return [parse_timestamp(str(value)) if value else None for value in values]
+
+
+def argsort(keys: Sequence[int]) -> Sequence[int]:
+    """Indices that order ``keys``; archived logs are usually already in order."""
+    if all(map(le, keys, islice(keys, 1, None))):
+        return range(len(keys))
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+
 def to_float(value) -> float | None:
     if value is None:
         return None
@@ -47,37 +122,148 @@ def to_float(value) -> float | None:
         return None
 
 
-def load_records(base_path: Path) -> List[dict]:
-    """Load rows from <base>.(csv|json)."""
+def finite_or_none(parsed: List[float | None]) -> List[float | None]:
+    # NaN/Infinity have no JSON representation (the page uses JSON.parse), so
+    # treat such cells as missing. The C-level sum spots them without a loop.
+    if not isfinite(sum(filter(None, parsed))):
+        return [value if value is None or isfinite(value) else None for value in parsed]
+    return parsed
+
+
+def to_float_column(values: Sequence) -> List[float | None]:
+    """Parse a whole column in one pass, falling back to ``to_float`` on bad cells.
+
+    Empty cells are common in sparse columns (``pnl``, ``profit_target``), so
+    they are mapped to ``None`` up front instead of raising per cell.
+    """
+    try:
+        parsed = [None if value is None or value == "" else float(value) for value in values]
+    except (TypeError, ValueError):
+        parsed = [to_float(value) for value in values]
+    return finite_or_none(parsed)
+
+
+def to_float_text_column(values: Sequence[str | None]) -> List[float | None]:
+    """``to_float_column`` for CSV cells, which are always ``str`` (or ``None`` padding)."""
+    try:
+        parsed = [float(value) if value else None for value in values]
+    except ValueError:
+        parsed = [to_float(value) for value in values]
+    return finite_or_none(parsed)
+
+
+def float_column(columns: Dict[str, list], name: str, length: int) -> List[float | None]:
+    return columns.get(name) or [None] * length
+
+
+def text_column(values: Sequence | None, length: int) -> List[str]:
+    if values is None:
+        return [""] * length
+    return ["" if value is None else str(value) for value in values]
+
+
+def rows_to_columns(rows: Iterable[dict]) -> Dict[str, list]:
+    """Transpose row dictionaries into per-column lists (missing cells become ``None``).
+
+    Rows are consumed one at a time, so a streamed source such as a JSON Lines
+    file never has all of its row dictionaries alive at once.
+    """
+    columns: Dict[str, list] = {}
+    count = 0
+    for row in rows:
+        if row.keys() == columns.keys():
+            for name, values in columns.items():
+                values.append(row[name])
+        else:
+            for name in row:
+                if name not in columns:
+                    columns[name] = [None] * count
+            for name, values in columns.items():
+                values.append(row.get(name))
+        count += 1
+    return columns
+
+
+def parse_json(raw: bytes):
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson is stricter (e.g. rejects NaN literals); let json decide.
+            pass
+    return json.loads(raw.decode("utf-8"))
+
+
+def load_json(path: Path):
+    return parse_json(path.read_bytes())
+
+
+def iter_json_lines(path: Path) -> Iterator[dict]:
+    """Yield the row on each non-blank line of a JSON Lines file."""
+    with path.open("rb") as handle:
+        for line in handle:
+            if line.strip():
+                yield parse_json(line)
+
+
+def load_columns(base_path: Path) -> Dict[str, list]:
+    """Load <base>.(csv|json|jsonl) as a mapping of column name to column values."""
     csv_path = base_path.with_suffix(".csv")
     if csv_path.exists():
         with csv_path.open(newline="", encoding="utf-8") as handle:
-            reader = csv.DictReader(handle)
-            return [dict(row) for row in reader]
+            reader = csv.reader(handle)
+            header = next(reader, [])
+            width = len(header)
+            rows = [row for row in reader if row]
+        # Match csv.DictReader: short rows are padded with None, extras dropped.
+        rows = [
+            row if len(row) == width else (row + [None] * width)[:width]
+            for row in rows
+        ]
+        columns = list(zip(*rows)) if rows else [()] * width
+        parsers = [to_float_text_column if name in NUMERIC_COLUMNS else list for name in header]
+        return {
+            name: parse(values) for name, parse, values in zip(header, parsers, columns)
+        }
 
     json_path = base_path.with_suffix(".json")
+    jsonl_path = base_path.with_suffix(".jsonl")
     if json_path.exists():
-        with json_path.open(encoding="utf-8") as handle:
-            payload = json.load(handle)
+        payload = load_json(json_path)
         if isinstance(payload, list):
-            return payload
-        if isinstance(payload, dict):
+            rows = payload
+        elif isinstance(payload, dict):
             # Accept { "rows": [...] } style payloads.
             if "rows" in payload and isinstance(payload["rows"], list):
-                return payload["rows"]
-            raise ValueError(
-                f"JSON file {json_path} must contain a list of rows, got a dict."
-            )
-        raise ValueError(f"Unsupported JSON payload type in {json_path}")
-    raise FileNotFoundError(
-        f"No csv/json file found for {base_path.name} inside {base_path.parent}"
-    )
+                rows = payload["rows"]
+            else:
+                raise ValueError(
+                    f"JSON file {json_path} must contain a list of rows, got a dict."
+                )
+        else:
+            raise ValueError(f"Unsupported JSON payload type in {json_path}")
+    elif jsonl_path.exists():
+        # Append-only logs: one object per line, parsed as the file is read.
+        rows = iter_json_lines(jsonl_path)
+    else:
+        raise FileNotFoundError(
+            f"No csv/json/jsonl file found for {base_path.name} inside {base_path.parent}"
+        )
+    columns = rows_to_columns(rows)
+    for name in NUMERIC_COLUMNS.intersection(columns):
+        columns[name] = to_float_column(columns[name])
+    return columns
+
 
+def round_cents(value: float | None) -> float | None:
+    """Round USD amounts for the payload; the page never shows sub-cent values."""
+    return None if value is None else round(value, 2)
 
-@dataclass
+
+@dataclass(slots=True)
 class PortfolioPoint:
     timestamp: str
-    dt: datetime
+    epoch_us: int
     balance: float | None
     equity: float | None
     return_pct: float | None
@@ -85,22 +271,11 @@ class PortfolioPoint:
     btc_price: float | None
     hodl_equity: float | None
 
-    def to_payload(self) -> dict:
-        return {
-            "timestamp": self.timestamp,
-            "balance": self.balance,
-            "equity": self.equity,
-            "return_pct": self.return_pct,
-            "positions": self.positions,
-            "btc_price": self.btc_price,
-            "hodl_equity": self.hodl_equity,
-        }
-
 
-@dataclass
+@dataclass(slots=True)
 class TradeEvent:
     timestamp: str
-    dt: datetime
+    epoch_us: int
     action: str
     side: str
     coin: str
@@ -116,25 +291,24 @@ class TradeEvent:
     plot_value: float | None
 
     def to_payload(self) -> dict:
+        # timestamp and plot_value are shipped separately as typed arrays.
         return {
-            "timestamp": self.timestamp,
             "action": self.action,
             "side": self.side,
             "coin": self.coin,
             "price": self.price,
             "quantity": self.quantity,
             "pnl": self.pnl,
-            "balance_after": self.balance_after,
+            "balance_after": round_cents(self.balance_after),
             "profit_target": self.profit_target,
             "stop_loss": self.stop_loss,
             "leverage": self.leverage,
             "confidence": self.confidence,
             "reason": self.reason,
-            "plot_value": self.plot_value,
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class CompletedTrade:
     entry_timestamp: str
     exit_timestamp: str | None
@@ -149,11 +323,19 @@ class CompletedTrade:
     confidence: float | None
     entry_reason: str
     exit_reason: str
+    entry_us: int
+    exit_us: int | None
+
+    @property
+    def marker_us(self) -> int:
+        """Exit time, or entry time for open positions."""
+        return self.entry_us if self.exit_us is None else self.exit_us
 
     def to_payload(self) -> dict:
+        # Times go out as epoch milliseconds so the page never parses dates.
         return {
-            "entry_timestamp": self.entry_timestamp,
-            "exit_timestamp": self.exit_timestamp,
+            "entry_ms": self.entry_us // 1000,
+            "exit_ms": None if self.exit_us is None else self.exit_us // 1000,
             "coin": self.coin,
             "side": self.side,
             "entry_price": self.entry_price,
@@ -168,26 +350,34 @@ class CompletedTrade:
         }
 
 
-def build_portfolio_points(records: Sequence[dict]) -> List[PortfolioPoint]:
+def build_portfolio_points(columns: Dict[str, list]) -> List[PortfolioPoint]:
+    timestamps = columns.get("timestamp") or []
+    count = len(timestamps)
+    balances = float_column(columns, "total_balance", count)
+    equities = float_column(columns, "total_equity", count)
+    returns = float_column(columns, "total_return_pct", count)
+    positions = float_column(columns, "num_positions", count)
+    btc_prices = float_column(columns, "btc_price", count)
+
+    parsed = parse_timestamp_column(timestamps)
+    rows = [idx for idx, dt in enumerate(parsed) if dt is not None]
+    keys = [epoch_micros(parsed[idx]) for idx in rows]
+
     points: List[PortfolioPoint] = []
-    for row in records:
-        raw_ts = row.get("timestamp")
-        if not raw_ts:
-            continue
-        dt = parse_timestamp(str(raw_ts))
+    for pos in argsort(keys):
+        idx = rows[pos]
         points.append(
             PortfolioPoint(
-                timestamp=dt.isoformat(),
-                dt=dt,
-                balance=to_float(row.get("total_balance")),
-                equity=to_float(row.get("total_equity")),
-                return_pct=to_float(row.get("total_return_pct")),
-                positions=to_float(row.get("num_positions")),
-                btc_price=to_float(row.get("btc_price")),
+                timestamp=parsed[idx].isoformat(),
+                epoch_us=keys[pos],
+                balance=balances[idx],
+                equity=equities[idx],
+                return_pct=returns[idx],
+                positions=positions[idx],
+                btc_price=btc_prices[idx],
                 hodl_equity=None,
             )
         )
-    points.sort(key=lambda point: point.dt)
     if not points:
         raise ValueError("portfolio_state dataset is empty – nothing to replay.")
 
@@ -203,93 +393,112 @@ def build_portfolio_points(records: Sequence[dict]) -> List[PortfolioPoint]:
     return points
 
 
-def infer_plot_value(trade_dt: datetime, timeline: List[datetime], values: List[float | None]) -> float | None:
-    if not timeline:
-        return None
-    idx = bisect_right(timeline, trade_dt) - 1
-    if idx < 0:
-        return None
-    candidate = values[idx]
-    return candidate if candidate is not None else None
-
-
-def build_trade_events(records: Sequence[dict], portfolio_points: List[PortfolioPoint]) -> List[TradeEvent]:
-    timeline = [point.dt for point in portfolio_points]
-    equity_values = [
-        point.equity if point.equity is not None else point.balance for point in portfolio_points
-    ]
-
+def build_trade_events(columns: Dict[str, list], portfolio_points: List[PortfolioPoint]) -> List[TradeEvent]:
+    timestamps = columns.get("timestamp") or []
+    count = len(timestamps)
+    actions = text_column(columns.get("action"), count)
+    sides = text_column(columns.get("side"), count)
+    coins = text_column(columns.get("coin"), count)
+    reasons = text_column(columns.get("reason"), count)
+    prices = float_column(columns, "price", count)
+    quantities = float_column(columns, "quantity", count)
+    pnls = float_column(columns, "pnl", count)
+    balances_after = float_column(columns, "balance_after", count)
+    profit_targets = float_column(columns, "profit_target", count)
+    stop_losses = float_column(columns, "stop_loss", count)
+    leverages = float_column(columns, "leverage", count)
+    confidences = float_column(columns, "confidence", count)
+
+    parsed = parse_timestamp_column(timestamps)
+    rows = [idx for idx, dt in enumerate(parsed) if dt is not None]
+    keys = [epoch_micros(parsed[idx]) for idx in rows]
+
+    # Only trades without a recorded balance need the portfolio curve; a
+    # binary search over the sorted points finds the latest one at or before
+    # the trade, without walking the points the other trades never touch.
+    point_time = attrgetter("epoch_us")
     events: List[TradeEvent] = []
-    for row in records:
-        raw_ts = row.get("timestamp")
-        if not raw_ts:
-            continue
-        dt = parse_timestamp(str(raw_ts))
-        balance_after = to_float(row.get("balance_after"))
+    for pos in argsort(keys):
+        idx = rows[pos]
+        balance_after = balances_after[idx]
         plot_value = balance_after
         if plot_value is None:
-            plot_value = infer_plot_value(dt, timeline, equity_values)
+            found = bisect_right(portfolio_points, keys[pos], key=point_time)
+            if found:
+                point = portfolio_points[found - 1]
+                plot_value = point.equity if point.equity is not None else point.balance
         events.append(
             TradeEvent(
-                timestamp=dt.isoformat(),
-                dt=dt,
-                action=str(row.get("action", "")).upper(),
-                side=str(row.get("side", "")).upper(),
-                coin=str(row.get("coin", "")),
-                price=to_float(row.get("price")),
-                quantity=to_float(row.get("quantity")),
-                pnl=to_float(row.get("pnl")),
+                timestamp=parsed[idx].isoformat(),
+                epoch_us=keys[pos],
+                action=actions[idx].upper(),
+                side=sides[idx].upper(),
+                coin=coins[idx],
+                price=prices[idx],
+                quantity=quantities[idx],
+                pnl=pnls[idx],
                 balance_after=balance_after,
-                profit_target=to_float(row.get("profit_target")),
-                stop_loss=to_float(row.get("stop_loss")),
-                leverage=to_float(row.get("leverage")),
-                confidence=to_float(row.get("confidence")),
-                reason=str(row.get("reason", "")),
+                profit_target=profit_targets[idx],
+                stop_loss=stop_losses[idx],
+                leverage=leverages[idx],
+                confidence=confidences[idx],
+                reason=reasons[idx],
                 plot_value=plot_value,
             )
         )
-    events.sort(key=lambda event: event.dt)
     if not events:
         raise ValueError("trade_history dataset is empty – nothing to replay.")
     return events
 
 
+def match_trade_events(events: Sequence[TradeEvent]) -> List[tuple[int | None, int | None]]:
+    """Pair ENTRY/CLOSE events FIFO per (coin, side) as ``(entry_idx, exit_idx)``.
+
+    Closes without a matching entry get ``None`` as entry index; entries that
+    are still open at the end of the data get ``None`` as exit index.
+    """
+    # Group entry indices per (coin, side) up front; each close then consumes
+    # the oldest unmatched entry of its group by advancing a cursor.
+    entries_by_key: dict[tuple[str, str], List[int]] = {}
+    closes: List[int] = []
+    for idx, event in enumerate(events):
+        action = event.action
+        if action == "ENTRY":
+            key = (event.coin, event.side)
+            group = entries_by_key.get(key)
+            if group is None:
+                entries_by_key[key] = [idx]
+            else:
+                group.append(idx)
+        elif action == "CLOSE":
+            closes.append(idx)
+
+    cursors = dict.fromkeys(entries_by_key, 0)
+    pairs: List[tuple[int | None, int | None]] = []
+    for exit_idx in closes:
+        event = events[exit_idx]
+        key = (event.coin, event.side)
+        group = entries_by_key.get(key)
+        entry_idx = None
+        if group is not None:
+            cursor = cursors[key]
+            # Only entries that happened before this close can be matched.
+            if cursor < len(group) and group[cursor] < exit_idx:
+                entry_idx = group[cursor]
+                cursors[key] = cursor + 1
+        pairs.append((entry_idx, exit_idx))
+
+    for key, group in entries_by_key.items():
+        pairs.extend((entry_idx, None) for entry_idx in group[cursors[key]:])
+    return pairs
+
+
 def pair_trade_events(events: List[TradeEvent]) -> List[CompletedTrade]:
-    open_positions: dict[tuple[str, str], deque[TradeEvent]] = {}
     completed: List[CompletedTrade] = []
 
-    for event in events:
-        key = (event.coin, event.side)
-        if event.action == "ENTRY":
-            open_positions.setdefault(key, deque()).append(event)
-        elif event.action == "CLOSE":
-            queue = open_positions.get(key)
-            entry_event = queue.popleft() if queue else None
-            duration_seconds = None
-            entry_timestamp = entry_event.timestamp if entry_event else event.timestamp
-            if entry_event:
-                duration_seconds = (event.dt - entry_event.dt).total_seconds()
-            completed.append(
-                CompletedTrade(
-                    entry_timestamp=entry_timestamp,
-                    exit_timestamp=event.timestamp,
-                    coin=event.coin,
-                    side=event.side,
-                    entry_price=entry_event.price if entry_event else None,
-                    exit_price=event.price,
-                    quantity=entry_event.quantity if entry_event else event.quantity,
-                    pnl=event.pnl,
-                    duration_seconds=duration_seconds,
-                    leverage=entry_event.leverage if entry_event else event.leverage,
-                    confidence=entry_event.confidence if entry_event else event.confidence,
-                    entry_reason=entry_event.reason if entry_event else "",
-                    exit_reason=event.reason,
-                )
-            )
-
-    for queue in open_positions.values():
-        while queue:
-            entry_event = queue.popleft()
+    for entry_idx, exit_idx in match_trade_events(events):
+        entry_event = events[entry_idx] if entry_idx is not None else None
+        if exit_idx is None:
             completed.append(
                 CompletedTrade(
                     entry_timestamp=entry_event.timestamp,
@@ -305,10 +514,38 @@ def pair_trade_events(events: List[TradeEvent]) -> List[CompletedTrade]:
                     confidence=entry_event.confidence,
                     entry_reason=entry_event.reason,
                     exit_reason="Open position",
+                    entry_us=entry_event.epoch_us,
+                    exit_us=None,
                 )
             )
+            continue
+
+        event = events[exit_idx]
+        duration_seconds = None
+        entry_timestamp = entry_event.timestamp if entry_event else event.timestamp
+        if entry_event:
+            duration_seconds = (event.epoch_us - entry_event.epoch_us) / 1_000_000
+        completed.append(
+            CompletedTrade(
+                entry_timestamp=entry_timestamp,
+                exit_timestamp=event.timestamp,
+                coin=event.coin,
+                side=event.side,
+                entry_price=entry_event.price if entry_event else None,
+                exit_price=event.price,
+                quantity=entry_event.quantity if entry_event else event.quantity,
+                pnl=event.pnl,
+                duration_seconds=duration_seconds,
+                leverage=entry_event.leverage if entry_event else event.leverage,
+                confidence=entry_event.confidence if entry_event else event.confidence,
+                entry_reason=entry_event.reason if entry_event else "",
+                exit_reason=event.reason,
+                entry_us=entry_event.epoch_us if entry_event else event.epoch_us,
+                exit_us=event.epoch_us,
+            )
+        )
 
-    completed.sort(key=lambda trade: trade.exit_timestamp or trade.entry_timestamp)
+    completed.sort(key=lambda trade: trade.marker_us)
     return completed
 
 
@@ -329,57 +566,39 @@ def compute_stats(
     trades: List[TradeEvent],
     completed_trades: List[CompletedTrade],
 ) -> dict:
-    def values_from_points(attribute: str) -> List[float]:
-        vals = []
-        for point in portfolio_points:
-            val = getattr(point, attribute, None)
-            if val is None:
-                continue
-            vals.append(val)
-        return vals
-
-    def first_equity_value() -> float | None:
-        for point in portfolio_points:
-            candidate = point.equity if point.equity is not None else point.balance
-            if candidate is not None:
-                return candidate
-        return None
-
-    def last_equity_value() -> float | None:
-        for point in reversed(portfolio_points):
-            candidate = point.equity if point.equity is not None else point.balance
-            if candidate is not None:
-                return candidate
-        return None
-
-    equities = [
-        point.equity if point.equity is not None else point.balance
-        for point in portfolio_points
-    ]
-    equities = [val for val in equities if val is not None]
-
-    max_drawdown_pct = None
-    if equities:
-        peak = equities[0]
-        worst = 0.0
-        for val in equities:
-            if val > peak:
-                peak = val
-            drawdown = (peak - val) / peak if peak else 0.0
-            if drawdown > worst:
-                worst = drawdown
-        max_drawdown_pct = worst * 100.0
-
-    start_equity = first_equity_value()
-    end_equity = last_equity_value()
+    # One pass tracks the running peak and worst drawdown alongside the
+    # endpoints; a plain comparison per point is several times cheaper than
+    # feeding builtin max() through accumulate() and a generator.
+    start_equity = None
+    end_equity = None
+    peak = None
+    worst = 0.0
+    hodl_start = None
+    hodl_end = None
+    for point in portfolio_points:
+        candidate = point.equity if point.equity is not None else point.balance
+        if candidate is not None:
+            if start_equity is None:
+                start_equity = candidate
+            end_equity = candidate
+            if peak is None or candidate > peak:
+                peak = candidate
+            elif peak > 0:
+                # Non-positive peaks never yield a positive drawdown.
+                drawdown = (peak - candidate) / peak
+                if drawdown > worst:
+                    worst = drawdown
+        if point.hodl_equity is not None:
+            if hodl_start is None:
+                hodl_start = point.hodl_equity
+            hodl_end = point.hodl_equity
+
+    max_drawdown_pct = None if peak is None else worst * 100.0
 
     net_return_pct = None
     if start_equity not in (None, 0) and end_equity is not None:
         net_return_pct = ((end_equity / start_equity) - 1.0) * 100.0
 
-    hodl_values = values_from_points("hodl_equity")
-    hodl_start = hodl_values[0] if hodl_values else None
-    hodl_end = hodl_values[-1] if hodl_values else None
     hodl_return_pct = None
     if hodl_start not in (None, 0) and hodl_end is not None:
         hodl_return_pct = ((hodl_end / hodl_start) - 1.0) * 100.0
@@ -391,14 +610,14 @@ def compute_stats(
     pnl_values = [trade.pnl for trade in completed_trades if trade.pnl is not None]
     win_rate = None
     if pnl_values:
-        wins = sum(1 for pnl in pnl_values if pnl > 0)
+        wins = sum(pnl > 0 for pnl in pnl_values)
         win_rate = (wins / len(pnl_values)) * 100.0
 
     runtime_hours = None
     if portfolio_points:
         duration = (
-            portfolio_points[-1].dt - portfolio_points[0].dt
-        ).total_seconds() / 3600.0
+            portfolio_points[-1].epoch_us - portfolio_points[0].epoch_us
+        ) / 3_600_000_000
         runtime_hours = max(duration, 0.0)
 
     return {
@@ -415,16 +634,1008 @@ def compute_stats(
     }
 
 
-def render_html(
+def write_json_array(handle: TextIO, payloads: Iterable[dict]) -> None:
+    """Stream ``payloads`` to ``handle`` as a JSON array, one element at a time."""
+    if orjson is not None:
+        dumps = orjson.dumps
+
+        def encode(payload: dict) -> str:
+            return dumps(payload).decode("utf-8")
+
+    else:
+        encode = json.JSONEncoder(separators=(",", ":")).encode
+    handle.write("[")
+    for idx, payload in enumerate(payloads):
+        if idx:
+            handle.write(",")
+        handle.write(encode(payload))
+    handle.write("]")
+
+
+def encode_array(typecode: str, values: Iterable) -> str:
+    """Pack ``values`` as a little-endian typed array, gzipped and base64-encoded."""
+    data = array(typecode, values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return base64.b64encode(gzip.compress(data.tobytes(), compresslevel=6, mtime=0)).decode("ascii")
+
+
+def usd_column(values: Iterable[float | None]) -> List[float]:
+    """Round USD amounts to cents, with NaN standing in for missing values."""
+    nan = float("nan")
+    return [nan if value is None else round(value, 2) for value in values]
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], budget: int) -> List[int]:
+    """Positions kept when Largest-Triangle-Three-Buckets reduces a series to ``budget``.
+
+    The first and last points are always kept. Each bucket in between keeps
+    the point forming the largest triangle with the previously kept point and
+    the average of the following bucket.
+    """
+    count = len(xs)
+    if budget >= count or budget < 3:
+        return list(range(count))
+    every = (count - 2) / (budget - 2)
+    kept = [0]
+    anchor = 0
+    for bucket in range(budget - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, count)
+        avg_x = sum(xs[end:next_end]) / (next_end - end)
+        avg_y = sum(ys[end:next_end]) / (next_end - end)
+        anchor_x = xs[anchor]
+        anchor_y = ys[anchor]
+        best_area = -1.0
+        for pos in range(start, end):
+            area = abs(
+                (anchor_x - avg_x) * (ys[pos] - anchor_y) - (anchor_x - xs[pos]) * (avg_y - anchor_y)
+            )
+            if area > best_area:
+                best_area = area
+                anchor = pos
+        kept.append(anchor)
+    kept.append(count - 1)
+    return kept
+
+
+def portfolio_series_payload(points: List[PortfolioPoint]) -> dict:
+    """Column-oriented chart data decoded by the page into typed arrays.
+
+    Timestamps are float64 epoch milliseconds, the same resolution as the
+    trade arrays they are compared against; USD series are float64 with NaN
+    marking missing values, one entry per portfolio point.
+    ``levels`` holds, for series of at least twice ``CHART_POINT_BUDGET``
+    points, successively halved down-samplings as int32 indices. The page
+    draws the coarsest level that still has ``budget`` points in the visible
+    prefix, so early frames are drawn at full resolution; the status panel
+    still reads every value.
+    """
+    times_ms = [point.epoch_us // 1000 for point in points]
+    payload = {"times": encode_array("d", times_ms), "budget": CHART_POINT_BUDGET}
+    levels = {}
+    for name, values in (
+        ("equity", [point.equity for point in points]),
+        ("balance", [point.balance for point in points]),
+        ("hodl", [point.hodl_equity for point in points]),
+    ):
+        payload[name] = encode_array("d", usd_column(values))
+        kept = [idx for idx, value in enumerate(values) if value is not None]
+        # Each level halves the one before it, so the levels add up to about
+        # as many indices as the series has points.
+        while len(kept) // 2 >= CHART_POINT_BUDGET:
+            positions = lttb_indices(
+                [times_ms[idx] for idx in kept],
+                [values[idx] for idx in kept],
+                len(kept) // 2,
+            )
+            kept = [kept[pos] for pos in positions]
+            levels.setdefault(name, []).append(encode_array("i", kept))
+    payload["levels"] = levels
+    return payload
+
+
+def write_compressed_json_array(handle: TextIO, payloads: Iterable[dict]) -> None:
+    """Write ``payloads`` as a base64-encoded, gzipped JSON array.
+
+    The page inflates it with the browser's native ``DecompressionStream``,
+    which keeps the generated HTML several times smaller than raw JSON.
+    """
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=6, mtime=0) as archive:
+        with io.TextIOWrapper(archive, encoding="utf-8") as text:
+            write_json_array(text, payloads)
+    handle.write(base64.b64encode(buffer.getvalue()).decode("ascii"))
+
+
+# Page template, kept pre-dedented so rendering is a single substitute call.
+# "$$" escapes the literal dollar signs of the JS template literals.
+HTML_TEMPLATE = Template("""\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1" />
+  <title>Trade Replay</title>
+  <link rel="preconnect" href="https://fonts.googleapis.com">
+  <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+  <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600&display=swap" rel="stylesheet">
+  <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.4/dist/chart.umd.min.js"></script>
+  <script src="https://cdn.jsdelivr.net/npm/chartjs-adapter-date-fns@3.0.0/dist/chartjs-adapter-date-fns.bundle.min.js"></script>
+
+
+  <style>
+    :root {
+      color-scheme: dark;
+      font-family: 'Inter', system-ui, -apple-system, BlinkMacSystemFont, sans-serif;
+      background-color: #010409;
+      color: #f8fafc;
+    }
+    * {
+      box-sizing: border-box;
+    }
+    body {
+      margin: 0;
+      min-height: 100vh;
+      display: flex;
+      justify-content: center;
+      align-items: flex-start;
+      padding: 2.5rem clamp(1.25rem, 4vw, 3rem);
+      background:
+        radial-gradient(circle at 20% 20%, rgba(1,195,141,0.18), transparent 55%),
+        radial-gradient(circle at 80% 10%, rgba(13,191,203,0.15), transparent 45%),
+        #010409;
+      overflow-x: hidden;
+    }
+    .aurora {
+      position: fixed;
+      inset: 0;
+      pointer-events: none;
+      z-index: 0;
+      mix-blend-mode: screen;
+      opacity: 0.35;
+      filter: blur(120px);
+      animation: drift 24s linear infinite;
+    }
+    .aurora-1 {
+      background: radial-gradient(circle at 20% 20%, rgba(1,195,141,0.8), transparent 60%);
+    }
+    .aurora-2 {
+      background: radial-gradient(circle at 80% 10%, rgba(13,191,203,0.7), transparent 55%);
+      animation-duration: 28s;
+    }
+    .aurora-3 {
+      background: radial-gradient(circle at 60% 80%, rgba(251,191,36,0.5), transparent 60%);
+      animation-duration: 32s;
+    }
+    @keyframes drift {
+      0% { transform: translate3d(0,0,0) scale(1); }
+      50% { transform: translate3d(-5%, -3%, 0) scale(1.1); }
+      100% { transform: translate3d(0,0,0) scale(1); }
+    }
+    .app {
+      width: min(1280px, 100%);
+      display: flex;
+      flex-direction: column;
+      gap: 2rem;
+      position: relative;
+      z-index: 1;
+    }
+    .card {
+      background: rgba(7,12,24,0.9);
+      border: 1px solid rgba(255,255,255,0.08);
+      border-radius: 24px;
+      padding: clamp(1.25rem, 2vw, 2rem);
+      box-shadow: 0 20px 60px rgba(2,6,23,0.7);
+      backdrop-filter: blur(18px);
+    }
+    .hero {
+      display: flex;
+      flex-direction: column;
+      gap: 1.5rem;
+      position: relative;
+      overflow: hidden;
+    }
+    .hero::after {
+      content: "";
+      position: absolute;
+      inset: 0;
+      background: linear-gradient(135deg, rgba(1,195,141,0.08), rgba(13,191,203,0));
+      opacity: 0.8;
+      pointer-events: none;
+    }
+    .hero-badge {
+      display: inline-flex;
+      align-items: center;
+      gap: 0.4rem;
+      padding: 0.3rem 0.9rem;
+      border-radius: 999px;
+      border: 1px solid rgba(1,195,141,0.5);
+      color: #8fffe0;
+      font-size: 0.85rem;
+      letter-spacing: 0.05em;
+      text-transform: uppercase;
+    }
+    .hero h1 {
+      margin: 0;
+      font-size: clamp(1.9rem, 3vw, 2.8rem);
+    }
+    .hero p {
+      margin: 0;
+      color: rgba(248,250,252,0.78);
+      max-width: 640px;
+    }
+    .stat-grid {
+      display: grid;
+      grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
+      gap: 1rem;
+      position: relative;
+      z-index: 1;
+    }
+    .stat-card {
+      padding: 1rem 1.2rem;
+      border-radius: 18px;
+      border: 1px solid rgba(255,255,255,0.08);
+      background: rgba(13,19,35,0.85);
+      display: flex;
+      flex-direction: column;
+      gap: 0.3rem;
+    }
+    .stat-card.primary {
+      background: linear-gradient(135deg, rgba(1,195,141,0.35), rgba(13,191,203,0.15));
+      border-color: rgba(1,195,141,0.5);
+      box-shadow: 0 15px 40px rgba(1,195,141,0.25);
+    }
+    .stat-card span {
+      font-size: 0.75rem;
+      text-transform: uppercase;
+      letter-spacing: 0.08em;
+      color: rgba(248,250,252,0.65);
+    }
+    .stat-card strong {
+      font-size: 1.6rem;
+      font-weight: 600;
+    }
+    .stat-card small {
+      font-size: 0.85rem;
+      color: rgba(248,250,252,0.7);
+    }
+    .chart-card {
+      position: relative;
+      overflow: hidden;
+    }
+    .chart-card::after {
+      content: "";
+      position: absolute;
+      inset: 0;
+      pointer-events: none;
+      background: radial-gradient(circle at 30% 0%, rgba(255,255,255,0.05), transparent 55%);
+    }
+    canvas {
+      width: 100% !important;
+      height: 460px !important;
+    }
+    .controls {
+      display: flex;
+      flex-wrap: wrap;
+      gap: 1rem;
+      align-items: center;
+      margin-top: 1.25rem;
+    }
+    button {
+      background: linear-gradient(135deg, #01c38d, #0dbfcb);
+      border: none;
+      color: #05060b;
+      font-weight: 600;
+      padding: 0.7rem 1.6rem;
+      border-radius: 999px;
+      cursor: pointer;
+      transition: transform 0.15s ease, box-shadow 0.15s ease;
+      box-shadow: 0 12px 30px rgba(13,191,203,0.28);
+    }
+    button:disabled {
+      opacity: 0.4;
+      cursor: not-allowed;
+      box-shadow: none;
+    }
+    button:not(:disabled):active {
+      transform: scale(0.96);
+    }
+    input[type="range"] {
+      flex: 1 1 240px;
+      accent-color: #01c38d;
+    }
+    select {
+      background: #0f1625;
+      border-radius: 999px;
+      border: 1px solid rgba(255,255,255,0.12);
+      padding: 0.45rem 0.9rem;
+      color: inherit;
+    }
+    .details {
+      display: grid;
+      gap: 1.5rem;
+      grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
+    }
+    .trade-card {
+      display: flex;
+      flex-direction: column;
+      gap: 1rem;
+    }
+    .status-panel {
+      display: grid;
+      gap: 0.8rem;
+      grid-template-columns: repeat(auto-fit, minmax(140px, 1fr));
+      background: linear-gradient(145deg, rgba(1,195,141,0.08), rgba(2,6,23,0.9));
+      border: 1px solid rgba(1,195,141,0.25);
+    }
+    .status-block {
+      display: flex;
+      flex-direction: column;
+      gap: 0.2rem;
+    }
+    .status-block span {
+      font-size: 0.75rem;
+      color: rgba(255,255,255,0.65);
+      text-transform: uppercase;
+      letter-spacing: 0.07em;
+    }
+    .status-value {
+      font-size: 1.3rem;
+      font-weight: 600;
+    }
+    .status-meta {
+      font-size: 0.85rem;
+      color: rgba(255,255,255,0.65);
+    }
+    .trade-log {
+      max-height: 300px;
+      overflow: auto;
+      border-top: 1px solid rgba(255,255,255,0.08);
+    }
+    .trade-item {
+      display: flex;
+      justify-content: space-between;
+      border-bottom: 1px solid rgba(255,255,255,0.04);
+      padding: 0.6rem 0;
+      gap: 1rem;
+    }
+    .trade-item:last-child {
+      border-bottom: none;
+    }
+    .trade-item .label {
+      font-weight: 600;
+      font-size: 0.95rem;
+    }
+    .trade-item .meta {
+      font-size: 0.85rem;
+      color: rgba(255,255,255,0.65);
+    }
+    .pnl-value {
+      font-size: 1.2rem;
+      font-weight: 600;
+      display: flex;
+      align-items: center;
+    }
+    .pnl-value.pos {
+      color: #00f5a0;
+    }
+    .pnl-value.neg {
+      color: #ff5f8f;
+    }
+    .trade-log::-webkit-scrollbar {
+      width: 6px;
+    }
+    .trade-log::-webkit-scrollbar-thumb {
+      background: rgba(255,255,255,0.18);
+      border-radius: 999px;
+    }
+    .time-label {
+      font-size: 0.95rem;
+      color: rgba(255,255,255,0.75);
+    }
+    @media (max-width: 720px) {
+      body {
+        padding: 1rem;
+      }
+      canvas {
+        height: 320px !important;
+      }
+      .controls {
+        flex-direction: column;
+        align-items: stretch;
+      }
+      button,
+      select {
+        width: 100%;
+        justify-content: center;
+      }
+      .stat-grid {
+        grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
+      }
+    }
+  </style>
+
+
+</head>
+<body>
+  <div class="aurora aurora-1"></div>
+  <div class="aurora aurora-2"></div>
+  <div class="aurora aurora-3"></div>
+  <main class="app">
+    <header class="hero card">
+      <div class="hero-badge">Session Replay</div>
+      <div>
+        <h1>Backtest Trade Replay</h1>
+        <p>Generated locally from the data in <code>$data_label</code>. Use the controls to scrub through the session.</p>
+      </div>
+      <div class="stat-grid">
+        <div class="stat-card primary">
+          <span>Final Equity</span>
+          <strong>$final_equity</strong>
+          <small>Net return $net_return</small>
+        </div>
+        <div class="stat-card">
+          <span>BTC HODL Benchmark</span>
+          <strong>$hodl_equity</strong>
+          <small>HODL return $hodl_return</small>
+        </div>
+        <div class="stat-card">
+          <span>Alpha vs HODL</span>
+          <strong>$alpha_display</strong>
+          <small>Strategy edge vs buy-and-hold</small>
+        </div>
+        <div class="stat-card">
+          <span>Trades Executed</span>
+          <strong>$total_trades_text</strong>
+          <small>Win rate $win_rate</small>
+        </div>
+        <div class="stat-card">
+          <span>Max Drawdown</span>
+          <strong>$max_dd_display</strong>
+          <small>Peak-to-valley damage</small>
+        </div>
+        <div class="stat-card">
+          <span>Session Duration</span>
+          <strong>$runtime_text</strong>
+          <small>Captured timeline</small>
+        </div>
+      </div>
+    </header>
+    <section class="card chart-card">
+      <canvas id="replayChart"></canvas>
+      <div class="controls">
+        <button id="playButton">Play</button>
+        <input id="frameSlider" type="range" min="0" max="$max_frame" value="0">
+        <label>
+          Speed
+          <select id="speedSelect">
+            <option value="1">1x</option>
+            <option value="2">2x</option>
+            <option value="4">4x</option>
+            <option value="8">8x</option>
+            <option value="10">10x</option>
+            <option value="50">50x</option>
+            <option value="100">100x</option>
+          </select>
+        </label>
+        <span id="timeLabel" class="time-label"></span>
+      </div>
+    </section>
+    <section class="details">
+      <div class="card status-panel" id="statusPanel">
+        <div class="status-block">
+          <span>Time</span>
+          <div class="status-value" id="statusTime">–</div>
+        </div>
+        <div class="status-block">
+          <span>Equity</span>
+          <div class="status-value" id="statusEquity">–</div>
+        </div>
+        <div class="status-block">
+          <span>BTC HODL</span>
+          <div class="status-value" id="statusHodl">–</div>
+        </div>
+        <div class="status-block">
+          <span>Last Trade</span>
+          <div class="status-value" id="statusTrade">No trades yet</div>
+        </div>
+      </div>
+      <div class="card trade-card">
+        <h2 style="margin-top:0;">Timeline</h2>
+        <div class="trade-log" id="tradeLog"></div>
+      </div>
+    </section>
+  </main>
+
+  <script type="application/json" id="portfolio-series">$portfolio_payload</script>
+  <script type="application/gzip-base64" id="trade-events">$trade_payload</script>
+  <script type="application/gzip-base64" id="trade-times">$trade_times</script>
+  <script type="application/gzip-base64" id="trade-values">$trade_values</script>
+  <script type="application/gzip-base64" id="completed-trades">$completed_payload</script>
+  <script type="application/gzip-base64" id="completed-markers">$completed_markers</script>
+
+  <script type="module">
+    // The payloads sit in non-executable data blocks, so the browser hands them
+    // over as plain text instead of parsing megabytes of string literals as JS.
+    function dataBlock(id) {
+      return document.getElementById(id).textContent;
+    }
+
+    async function inflate(encoded) {
+      const bytes = Uint8Array.from(atob(encoded), c => c.charCodeAt(0));
+      const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+      return new Response(stream).arrayBuffer();
+    }
+
+    async function inflateJson(encoded) {
+      return JSON.parse(new TextDecoder().decode(await inflate(encoded)));
+    }
+
+    async function inflateLevels(encoded = []) {
+      return Promise.all(encoded.map(async level => new Int32Array(await inflate(level))));
+    }
+
+    const portfolioSeries = JSON.parse(dataBlock('portfolio-series'));
+    const [
+      timestampsMs, equityValues, balanceValues, hodlValues, equityLevels, balanceLevels, hodlLevels,
+      tradeEvents, tradeTimes, tradeValues, completedTrades, completedMarkers,
+    ] = await Promise.all([
+      inflate(portfolioSeries.times).then(buffer => new Float64Array(buffer)),
+      inflate(portfolioSeries.equity).then(buffer => new Float64Array(buffer)),
+      inflate(portfolioSeries.balance).then(buffer => new Float64Array(buffer)),
+      inflate(portfolioSeries.hodl).then(buffer => new Float64Array(buffer)),
+      inflateLevels(portfolioSeries.levels.equity),
+      inflateLevels(portfolioSeries.levels.balance),
+      inflateLevels(portfolioSeries.levels.hodl),
+      inflateJson(dataBlock('trade-events')),
+      inflate(dataBlock('trade-times')).then(buffer => new Float64Array(buffer)),
+      inflate(dataBlock('trade-values')).then(buffer => new Float64Array(buffer)),
+      inflateJson(dataBlock('completed-trades')),
+      inflate(dataBlock('completed-markers')).then(buffer => new Float64Array(buffer)),
+    ]);
+    const ctx = document.getElementById('replayChart').getContext('2d');
+
+    // The line series are built as { x: epoch ms, y: number } points, which is
+    // Chart.js's internal format for a time scale, so parsing is skipped and
+    // chart.update() does not re-read every visible point on each frame.
+    const equityDataset = {
+      type: 'line',
+      label: 'Equity',
+      data: [],
+      parsing: false,
+      borderColor: '#00e6a8',
+      backgroundColor: 'rgba(0, 230, 168, 0.08)',
+      fill: true,
+      tension: 0.3,
+      pointRadius: 0,
+      borderWidth: 2
+    };
+
+    const balanceDataset = {
+      type: 'line',
+      label: 'Balance',
+      data: [],
+      parsing: false,
+      borderColor: '#3b82f6',
+      backgroundColor: 'rgba(59,130,246,0.05)',
+      fill: false,
+      tension: 0.15,
+      pointRadius: 0,
+      borderWidth: 1.2,
+      borderDash: [6, 3]
+    };
+
+    const hodlDataset = {
+      type: 'line',
+      label: 'BTC HODL',
+      data: [],
+      parsing: false,
+      borderColor: '#fbbf24',
+      backgroundColor: 'rgba(251,191,36,0.08)',
+      fill: false,
+      tension: 0.25,
+      pointRadius: 0,
+      borderWidth: 1.6,
+      borderDash: [3, 3]
+    };
+
+    // Marker styles are resolved once per event instead of through scriptable
+    // callbacks on every draw. Chart.js indexes these arrays by data index,
+    // which is the event index because the visible trades are always a prefix.
+    const tradeRadii = tradeEvents.map(evt => evt.action === 'CLOSE' ? 6 : 4);
+    const tradeColors = tradeEvents.map(evt => {
+      if (evt.action === 'ENTRY') return evt.side === 'LONG' ? '#22d3ee' : '#f97316';
+      return evt.pnl >= 0 ? '#00ff9d' : '#ff4d6d';
+    });
+
+    const tradesDataset = {
+      type: 'scatter',
+      label: 'Trades',
+      data: [],
+      parsing: false,
+      pointRadius: tradeRadii,
+      pointHoverRadius: 8,
+      pointBackgroundColor: tradeColors,
+      pointBorderColor: 'rgba(0,0,0,0.6)',
+      pointBorderWidth: 1,
+    };
+
+    const chart = new Chart(ctx, {
+      data: {
+        datasets: [equityDataset, balanceDataset, hodlDataset, tradesDataset]
+      },
+      options: {
+        responsive: true,
+        animation: false,
+        interaction: {
+          mode: 'nearest',
+          intersect: false,
+        },
+        scales: {
+          x: {
+            type: 'time',
+            time: {
+              tooltipFormat: 'yyyy-MM-dd HH:mm'
+            },
+            grid: {
+              color: 'rgba(255,255,255,0.05)'
+            },
+            ticks: {
+              color: 'rgba(255,255,255,0.7)'
+            }
+          },
+          y: {
+            title: {
+              display: true,
+              text: 'USD'
+            },
+            grid: {
+              color: 'rgba(255,255,255,0.05)'
+            },
+            ticks: {
+              color: 'rgba(255,255,255,0.7)'
+            }
+          }
+        },
+        plugins: {
+          legend: {
+            position: 'top',
+            labels: {
+              usePointStyle: true,
+            }
+          },
+          tooltip: {
+            callbacks: {
+              label: ctx => {
+                if (ctx.dataset.type === 'scatter') {
+                  const raw = ctx.raw;
+                  return `$${raw.action} $${raw.coin} @ $${raw.price ?? '—'} (PnL $${formatUsd(raw.pnl)})`;
+                }
+                return `$${ctx.dataset.label}: $${formatUsd(ctx.parsed.y)}`;
+              }
+            }
+          }
+        }
+      }
+    });
+
+    const playButton = document.getElementById('playButton');
+    const frameSlider = document.getElementById('frameSlider');
+    const speedSelect = document.getElementById('speedSelect');
+    const timeLabel = document.getElementById('timeLabel');
+    const statusTime = document.getElementById('statusTime');
+    const statusEquity = document.getElementById('statusEquity');
+    const statusHodl = document.getElementById('statusHodl');
+    const statusTrade = document.getElementById('statusTrade');
+    const tradeLog = document.getElementById('tradeLog');
+
+    let currentFrame = 0;
+    let playing = false;
+    let rafId = null;
+    const maxFrame = Number(frameSlider.max);
+
+    const speeds = {
+      1: 650,
+      2: 420,
+      4: 220,
+      8: 120,
+      10: 80,
+      50: 30,
+      100: 15
+    };
+
+    // toLocaleString() builds a new Intl formatter on every call. These shared
+    // formatters use the same options, so the text is unchanged, and the
+    // labels for repeated timestamps are memoized.
+    const usdFormat = new Intl.NumberFormat(undefined, { minimumFractionDigits: 2, maximumFractionDigits: 2 });
+    const dateTimeFormat = new Intl.DateTimeFormat(undefined, {
+      year: 'numeric', month: 'numeric', day: 'numeric',
+      hour: 'numeric', minute: 'numeric', second: 'numeric',
+    });
+    const timestampLabels = new Map();
+    const frameLabels = new Array(maxFrame + 1);
+
+    function formatUsd(value) {
+      if (value == null || isNaN(value)) return '—';
+      return usdFormat.format(Number(value));
+    }
+
+    function formatUsdDisplay(value) {
+      const formatted = formatUsd(value);
+      return formatted === '—' ? '—' : '$$' + formatted;
+    }
+
+    function formatTimestamp(ms) {
+      if (ms == null) return '—';
+      let label = timestampLabels.get(ms);
+      if (label === undefined) {
+        label = dateTimeFormat.format(ms);
+        timestampLabels.set(ms, label);
+      }
+      return label;
+    }
+
+    function formatFrameTime(frameIdx) {
+      return frameLabels[frameIdx] ??= dateTimeFormat.format(timestampsMs[frameIdx]);
+    }
+
+    function formatDuration(seconds) {
+      if (seconds == null || isNaN(seconds)) return '—';
+      const abs = Math.abs(seconds);
+      if (abs >= 86400) {
+        return `$${(abs / 86400).toFixed(1)} d`;
+      }
+      if (abs >= 3600) {
+        return `$${(abs / 3600).toFixed(1)} h`;
+      }
+      return `$${(abs / 60).toFixed(0)} m`;
+    }
+
+    function updateStatus(frameIdx, latestTrade) {
+      statusTime.textContent = formatFrameTime(frameIdx);
+      const equity = equityValues[frameIdx];
+      statusEquity.textContent = formatUsdDisplay(Number.isNaN(equity) ? balanceValues[frameIdx] : equity);
+      statusHodl.textContent = formatUsdDisplay(hodlValues[frameIdx]);
+      if (latestTrade) {
+        const pnlStr = formatUsdDisplay(latestTrade.pnl);
+        const durationStr = formatDuration(latestTrade.duration_seconds);
+        statusTrade.innerHTML = `<strong>$${latestTrade.coin} $${latestTrade.side}</strong><br><span class="status-meta">PnL $${pnlStr} · $${durationStr}</span>`;
+      } else {
+        statusTrade.textContent = 'No trades yet';
+      }
+    }
+
+    // Number of entries in the ascending array that are <= value.
+    function upperBound(sorted, value) {
+      let lo = 0;
+      let hi = sorted.length;
+      while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (sorted[mid] <= value) lo = mid + 1;
+        else hi = mid;
+      }
+      return lo;
+    }
+
+    // The log shows the newest 25 visible trades. Its rows are created once and
+    // only their text is updated, and only when the visible count changes.
+    const tradeLogSize = 25;
+    const tradeLogRows = Array.from({ length: tradeLogSize }, () => {
+      const item = document.createElement('div');
+      item.className = 'trade-item';
+      const details = document.createElement('div');
+      const label = document.createElement('div');
+      label.className = 'label';
+      const entry = document.createElement('div');
+      entry.className = 'meta';
+      const exit = document.createElement('div');
+      exit.className = 'meta';
+      const pnl = document.createElement('div');
+      pnl.className = 'pnl-value';
+      details.append(label, entry, exit);
+      item.append(details, pnl);
+      return { item, label, entry, exit, pnl };
+    });
+    let renderedLogCount = -1;
+    let attachedLogRows = 0;
+
+    function renderTradeLog(visibleCount) {
+      if (visibleCount === renderedLogCount) return;
+      renderedLogCount = visibleCount;
+      const rowCount = Math.min(visibleCount, tradeLogSize);
+      if (rowCount !== attachedLogRows) {
+        tradeLog.replaceChildren(...tradeLogRows.slice(0, rowCount).map(row => row.item));
+        attachedLogRows = rowCount;
+      }
+      for (let offset = 0; offset < rowCount; offset++) {
+        const trade = completedTrades[visibleCount - 1 - offset];
+        const row = tradeLogRows[offset];
+        row.label.textContent = `$${trade.coin} $${trade.side}`;
+        row.entry.textContent = `Entry $${formatTimestamp(trade.entry_ms)} @ $${formatUsdDisplay(trade.entry_price)}`;
+        row.exit.textContent = `Exit $${formatTimestamp(trade.exit_ms)} @ $${formatUsdDisplay(trade.exit_price)} · Duration $${formatDuration(trade.duration_seconds)}`;
+        row.pnl.textContent = formatUsdDisplay(trade.pnl);
+        row.pnl.classList.toggle('pos', trade.pnl != null && trade.pnl >= 0);
+        row.pnl.classList.toggle('neg', trade.pnl != null && trade.pnl < 0);
+      }
+    }
+
+    // Chart points are built once; counts[i] is how many of them are visible
+    // at frame i, so each frame only slices a prefix instead of re-filtering.
+    // Long series also arrive with build-time down-sampled levels, each half
+    // the size of the one before; a level's visible count is a binary search
+    // over its frame indices.
+    function buildSeries(values, levels) {
+      const points = [];
+      const counts = new Int32Array(values.length);
+      for (let i = 0; i < values.length; i++) {
+        if (!Number.isNaN(values[i])) points.push({ x: timestampsMs[i], y: values[i] });
+        counts[i] = points.length;
+      }
+      const coarse = levels.map(kept => ({
+        kept,
+        points: Array.from(kept, i => ({ x: timestampsMs[i], y: values[i] })),
+      }));
+      return { points, counts, coarse, values };
+    }
+
+    const equitySeries = buildSeries(equityValues, equityLevels);
+    const balanceSeries = buildSeries(balanceValues, balanceLevels);
+    const hodlSeries = buildSeries(hodlValues, hodlLevels);
+
+    // The coarsest level with at least a budget of points on screen is drawn,
+    // so the visible part of the line keeps the same density as it grows. A
+    // down-sampled series may not have a point at the current frame; the
+    // frame's own value is appended so the line always ends at the playhead.
+    function visiblePoints(series, frameIdx) {
+      let source = series.points;
+      let count = series.counts[frameIdx];
+      for (let k = series.coarse.length - 1; k >= 0; k--) {
+        const level = series.coarse[k];
+        const levelCount = upperBound(level.kept, frameIdx);
+        if (levelCount >= portfolioSeries.budget) {
+          source = level.points;
+          count = levelCount;
+          break;
+        }
+      }
+      const points = source.slice(0, count);
+      const value = series.values[frameIdx];
+      if (!Number.isNaN(value) && (count === 0 || points[count - 1].x !== timestampsMs[frameIdx])) {
+        points.push({ x: timestampsMs[frameIdx], y: value });
+      }
+      return points;
+    }
+
+    // Trade times are sorted, so the visible trade points are a prefix. It is
+    // extended with the newly revealed events as playback moves forward and
+    // cut back when the slider moves backwards, rather than rebuilt per frame.
+    function showTradePoints(count) {
+      const points = tradesDataset.data;
+      if (count < points.length) {
+        points.splice(count);
+        return;
+      }
+      for (let i = points.length; i < count; i++) {
+        const y = tradeValues[i];
+        points.push({ x: tradeTimes[i], y: Number.isNaN(y) ? null : y, ...tradeEvents[i] });
+      }
+    }
+
+    // Frame currently drawn on the chart. The x axis runs from the first
+    // snapshot to the current frame, so during playback a step smaller than one
+    // pixel of that span would redraw an identical chart and is skipped; the
+    // status panel, trade log and time label still follow every frame.
+    let drawnFrame = -1;
+
+    function movesAPixel(frameIdx) {
+      const width = chart.chartArea?.width;
+      if (!width || drawnFrame < 0 || frameIdx === maxFrame) return true;
+      const span = timestampsMs[frameIdx] - timestampsMs[0];
+      return (timestampsMs[frameIdx] - timestampsMs[drawnFrame]) * width >= span;
+    }
+
+    function sliceSeries(frameIdx, redrawChart = true) {
+      const cutoffMs = timestampsMs[frameIdx];
+      if (redrawChart) {
+        drawnFrame = frameIdx;
+        equityDataset.data = visiblePoints(equitySeries, frameIdx);
+        balanceDataset.data = visiblePoints(balanceSeries, frameIdx);
+        hodlDataset.data = visiblePoints(hodlSeries, frameIdx);
+        showTradePoints(upperBound(tradeTimes, cutoffMs));
+        chart.update('none');
+      }
+      // Completed trades are sorted by exit (or entry) time, so the visible
+      // ones are a prefix whose length a binary search finds.
+      const visibleTrades = upperBound(completedMarkers, cutoffMs);
+      const latestTrade = visibleTrades > 0 ? completedTrades[visibleTrades - 1] : null;
+      updateStatus(frameIdx, latestTrade);
+      renderTradeLog(visibleTrades);
+      timeLabel.textContent = formatFrameTime(frameIdx);
+    }
+
+    function step(timestamp) {
+      if (!playing) return;
+      const delay = speeds[speedSelect.value] ?? speeds[1];
+      if (!step.lastTime || timestamp - step.lastTime >= delay) {
+        currentFrame = Math.min(currentFrame + 1, maxFrame);
+        frameSlider.value = currentFrame;
+        sliceSeries(currentFrame, movesAPixel(currentFrame));
+        step.lastTime = timestamp;
+        if (currentFrame === maxFrame) {
+          playing = false;
+          playButton.textContent = 'Replay';
+          return;
+        }
+      }
+      rafId = requestAnimationFrame(step);
+    }
+
+    playButton.addEventListener('click', () => {
+      if (playing) {
+        playing = false;
+        playButton.textContent = 'Play';
+        if (rafId) cancelAnimationFrame(rafId);
+        if (drawnFrame !== currentFrame) sliceSeries(currentFrame);
+        return;
+      }
+      if (currentFrame === maxFrame) {
+        currentFrame = 0;
+        frameSlider.value = 0;
+        sliceSeries(0);
+      }
+      playing = true;
+      playButton.textContent = 'Pause';
+      step.lastTime = null;
+      rafId = requestAnimationFrame(step);
+    });
+
+    // Pointer drags can fire input events faster than the display refreshes;
+    // redraw at most once per animation frame with the latest slider value.
+    let sliderRedrawPending = false;
+    frameSlider.addEventListener('input', (event) => {
+      currentFrame = Number(event.target.value);
+      if (sliderRedrawPending) return;
+      sliderRedrawPending = true;
+      requestAnimationFrame(() => {
+        sliderRedrawPending = false;
+        sliceSeries(currentFrame);
+      });
+    });
+
+    window.addEventListener('keydown', (event) => {
+      if (event.code === 'Space') {
+        event.preventDefault();
+        playButton.click();
+      }
+    });
+
+    sliceSeries(0);
+  </script>
+</body>
+</html>
+""")
+
+# split() with a capturing group alternates static template text and slot
+# names. Splitting the template rather than the rendered page keeps user text
+# such as the data directory name from ever being read as a slot.
+TEMPLATE_PARTS = [
+    Template(part) if idx % 2 == 0 else part
+    for idx, part in enumerate(
+        re.split(rf"\$({'|'.join(PAYLOAD_SLOTS)})\b", HTML_TEMPLATE.template)
+    )
+]
+
+
+def write_html(
+    handle: TextIO,
     portfolio_points: List[PortfolioPoint],
     trades: List[TradeEvent],
     completed_trades: List[CompletedTrade],
     data_label: str,
     stats: dict,
-) -> str:
-    portfolio_payload = json.dumps([point.to_payload() for point in portfolio_points])
-    trade_payload = json.dumps([trade.to_payload() for trade in trades])
-    completed_payload = json.dumps([trade.to_payload() for trade in completed_trades])
+) -> None:
     max_frame = max(len(portfolio_points) - 1, 0)
 
     final_equity = safe_currency(stats.get("end_equity"))
@@ -446,698 +1657,48 @@ def render_html(
     total_trades_text = "—" if total_trades is None else f"{total_trades:,}"
     alpha_display = alpha_return
 
-    return dedent(
-        f"""\
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-          <meta charset="utf-8" />
-          <meta name="viewport" content="width=device-width, initial-scale=1" />
-          <title>Trade Replay</title>
-          <link rel="preconnect" href="https://fonts.googleapis.com">
-          <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-          <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600&display=swap" rel="stylesheet">
-          <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.4/dist/chart.umd.min.js"></script>
-          <script src="https://cdn.jsdelivr.net/npm/chartjs-adapter-date-fns@3.0.0/dist/chartjs-adapter-date-fns.bundle.min.js"></script>
-          
-          
-          <style>
-            :root {{
-              color-scheme: dark;
-              font-family: 'Inter', system-ui, -apple-system, BlinkMacSystemFont, sans-serif;
-              background-color: #010409;
-              color: #f8fafc;
-            }}
-            * {{
-              box-sizing: border-box;
-            }}
-            body {{
-              margin: 0;
-              min-height: 100vh;
-              display: flex;
-              justify-content: center;
-              align-items: flex-start;
-              padding: 2.5rem clamp(1.25rem, 4vw, 3rem);
-              background:
-                radial-gradient(circle at 20% 20%, rgba(1,195,141,0.18), transparent 55%),
-                radial-gradient(circle at 80% 10%, rgba(13,191,203,0.15), transparent 45%),
-                #010409;
-              overflow-x: hidden;
-            }}
-            .aurora {{
-              position: fixed;
-              inset: 0;
-              pointer-events: none;
-              z-index: 0;
-              mix-blend-mode: screen;
-              opacity: 0.35;
-              filter: blur(120px);
-              animation: drift 24s linear infinite;
-            }}
-            .aurora-1 {{
-              background: radial-gradient(circle at 20% 20%, rgba(1,195,141,0.8), transparent 60%);
-            }}
-            .aurora-2 {{
-              background: radial-gradient(circle at 80% 10%, rgba(13,191,203,0.7), transparent 55%);
-              animation-duration: 28s;
-            }}
-            .aurora-3 {{
-              background: radial-gradient(circle at 60% 80%, rgba(251,191,36,0.5), transparent 60%);
-              animation-duration: 32s;
-            }}
-            @keyframes drift {{
-              0% {{ transform: translate3d(0,0,0) scale(1); }}
-              50% {{ transform: translate3d(-5%, -3%, 0) scale(1.1); }}
-              100% {{ transform: translate3d(0,0,0) scale(1); }}
-            }}
-            .app {{
-              width: min(1280px, 100%);
-              display: flex;
-              flex-direction: column;
-              gap: 2rem;
-              position: relative;
-              z-index: 1;
-            }}
-            .card {{
-              background: rgba(7,12,24,0.9);
-              border: 1px solid rgba(255,255,255,0.08);
-              border-radius: 24px;
-              padding: clamp(1.25rem, 2vw, 2rem);
-              box-shadow: 0 20px 60px rgba(2,6,23,0.7);
-              backdrop-filter: blur(18px);
-            }}
-            .hero {{
-              display: flex;
-              flex-direction: column;
-              gap: 1.5rem;
-              position: relative;
-              overflow: hidden;
-            }}
-            .hero::after {{
-              content: "";
-              position: absolute;
-              inset: 0;
-              background: linear-gradient(135deg, rgba(1,195,141,0.08), rgba(13,191,203,0));
-              opacity: 0.8;
-              pointer-events: none;
-            }}
-            .hero-badge {{
-              display: inline-flex;
-              align-items: center;
-              gap: 0.4rem;
-              padding: 0.3rem 0.9rem;
-              border-radius: 999px;
-              border: 1px solid rgba(1,195,141,0.5);
-              color: #8fffe0;
-              font-size: 0.85rem;
-              letter-spacing: 0.05em;
-              text-transform: uppercase;
-            }}
-            .hero h1 {{
-              margin: 0;
-              font-size: clamp(1.9rem, 3vw, 2.8rem);
-            }}
-            .hero p {{
-              margin: 0;
-              color: rgba(248,250,252,0.78);
-              max-width: 640px;
-            }}
-            .stat-grid {{
-              display: grid;
-              grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
-              gap: 1rem;
-              position: relative;
-              z-index: 1;
-            }}
-            .stat-card {{
-              padding: 1rem 1.2rem;
-              border-radius: 18px;
-              border: 1px solid rgba(255,255,255,0.08);
-              background: rgba(13,19,35,0.85);
-              display: flex;
-              flex-direction: column;
-              gap: 0.3rem;
-            }}
-            .stat-card.primary {{
-              background: linear-gradient(135deg, rgba(1,195,141,0.35), rgba(13,191,203,0.15));
-              border-color: rgba(1,195,141,0.5);
-              box-shadow: 0 15px 40px rgba(1,195,141,0.25);
-            }}
-            .stat-card span {{
-              font-size: 0.75rem;
-              text-transform: uppercase;
-              letter-spacing: 0.08em;
-              color: rgba(248,250,252,0.65);
-            }}
-            .stat-card strong {{
-              font-size: 1.6rem;
-              font-weight: 600;
-            }}
-            .stat-card small {{
-              font-size: 0.85rem;
-              color: rgba(248,250,252,0.7);
-            }}
-            .chart-card {{
-              position: relative;
-              overflow: hidden;
-            }}
-            .chart-card::after {{
-              content: "";
-              position: absolute;
-              inset: 0;
-              pointer-events: none;
-              background: radial-gradient(circle at 30% 0%, rgba(255,255,255,0.05), transparent 55%);
-            }}
-            canvas {{
-              width: 100% !important;
-              height: 460px !important;
-            }}
-            .controls {{
-              display: flex;
-              flex-wrap: wrap;
-              gap: 1rem;
-              align-items: center;
-              margin-top: 1.25rem;
-            }}
-            button {{
-              background: linear-gradient(135deg, #01c38d, #0dbfcb);
-              border: none;
-              color: #05060b;
-              font-weight: 600;
-              padding: 0.7rem 1.6rem;
-              border-radius: 999px;
-              cursor: pointer;
-              transition: transform 0.15s ease, box-shadow 0.15s ease;
-              box-shadow: 0 12px 30px rgba(13,191,203,0.28);
-            }}
-            button:disabled {{
-              opacity: 0.4;
-              cursor: not-allowed;
-              box-shadow: none;
-            }}
-            button:not(:disabled):active {{
-              transform: scale(0.96);
-            }}
-            input[type="range"] {{
-              flex: 1 1 240px;
-              accent-color: #01c38d;
-            }}
-            select {{
-              background: #0f1625;
-              border-radius: 999px;
-              border: 1px solid rgba(255,255,255,0.12);
-              padding: 0.45rem 0.9rem;
-              color: inherit;
-            }}
-            .details {{
-              display: grid;
-              gap: 1.5rem;
-              grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-            }}
-            .trade-card {{
-              display: flex;
-              flex-direction: column;
-              gap: 1rem;
-            }}
-            .status-panel {{
-              display: grid;
-              gap: 0.8rem;
-              grid-template-columns: repeat(auto-fit, minmax(140px, 1fr));
-              background: linear-gradient(145deg, rgba(1,195,141,0.08), rgba(2,6,23,0.9));
-              border: 1px solid rgba(1,195,141,0.25);
-            }}
-            .status-block {{
-              display: flex;
-              flex-direction: column;
-              gap: 0.2rem;
-            }}
-            .status-block span {{
-              font-size: 0.75rem;
-              color: rgba(255,255,255,0.65);
-              text-transform: uppercase;
-              letter-spacing: 0.07em;
-            }}
-            .status-value {{
-              font-size: 1.3rem;
-              font-weight: 600;
-            }}
-            .status-meta {{
-              font-size: 0.85rem;
-              color: rgba(255,255,255,0.65);
-            }}
-            .trade-log {{
-              max-height: 300px;
-              overflow: auto;
-              border-top: 1px solid rgba(255,255,255,0.08);
-            }}
-            .trade-item {{
-              display: flex;
-              justify-content: space-between;
-              border-bottom: 1px solid rgba(255,255,255,0.04);
-              padding: 0.6rem 0;
-              gap: 1rem;
-            }}
-            .trade-item:last-child {{
-              border-bottom: none;
-            }}
-            .trade-item .label {{
-              font-weight: 600;
-              font-size: 0.95rem;
-            }}
-            .trade-item .meta {{
-              font-size: 0.85rem;
-              color: rgba(255,255,255,0.65);
-            }}
-            .pnl-value {{
-              font-size: 1.2rem;
-              font-weight: 600;
-              display: flex;
-              align-items: center;
-            }}
-            .pnl-value.pos {{
-              color: #00f5a0;
-            }}
-            .pnl-value.neg {{
-              color: #ff5f8f;
-            }}
-            .trade-log::-webkit-scrollbar {{
-              width: 6px;
-            }}
-            .trade-log::-webkit-scrollbar-thumb {{
-              background: rgba(255,255,255,0.18);
-              border-radius: 999px;
-            }}
-            .time-label {{
-              font-size: 0.95rem;
-              color: rgba(255,255,255,0.75);
-            }}
-            @media (max-width: 720px) {{
-              body {{
-                padding: 1rem;
-              }}
-              canvas {{
-                height: 320px !important;
-              }}
-              .controls {{
-                flex-direction: column;
-                align-items: stretch;
-              }}
-              button,
-              select {{
-                width: 100%;
-                justify-content: center;
-              }}
-              .stat-grid {{
-                grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-              }}
-            }}
-          </style>
-
-
-        </head>
-        <body>
-          <div class="aurora aurora-1"></div>
-          <div class="aurora aurora-2"></div>
-          <div class="aurora aurora-3"></div>
-          <main class="app">
-            <header class="hero card">
-              <div class="hero-badge">Session Replay</div>
-              <div>
-                <h1>Backtest Trade Replay</h1>
-                <p>Generated locally from the data in <code>{data_label}</code>. Use the controls to scrub through the session.</p>
-              </div>
-              <div class="stat-grid">
-                <div class="stat-card primary">
-                  <span>Final Equity</span>
-                  <strong>{final_equity}</strong>
-                  <small>Net return {net_return}</small>
-                </div>
-                <div class="stat-card">
-                  <span>BTC HODL Benchmark</span>
-                  <strong>{hodl_equity}</strong>
-                  <small>HODL return {hodl_return}</small>
-                </div>
-                <div class="stat-card">
-                  <span>Alpha vs HODL</span>
-                  <strong>{alpha_display}</strong>
-                  <small>Strategy edge vs buy-and-hold</small>
-                </div>
-                <div class="stat-card">
-                  <span>Trades Executed</span>
-                  <strong>{total_trades_text}</strong>
-                  <small>Win rate {win_rate}</small>
-                </div>
-                <div class="stat-card">
-                  <span>Max Drawdown</span>
-                  <strong>{max_dd_display}</strong>
-                  <small>Peak-to-valley damage</small>
-                </div>
-                <div class="stat-card">
-                  <span>Session Duration</span>
-                  <strong>{runtime_text}</strong>
-                  <small>Captured timeline</small>
-                </div>
-              </div>
-            </header>
-            <section class="card chart-card">
-              <canvas id="replayChart"></canvas>
-              <div class="controls">
-                <button id="playButton">Play</button>
-                <input id="frameSlider" type="range" min="0" max="{max_frame}" value="0">
-                <label>
-                  Speed
-                  <select id="speedSelect">
-                    <option value="1">1x</option>
-                    <option value="2">2x</option>
-                    <option value="4">4x</option>
-                    <option value="8">8x</option>
-                    <option value="10">10x</option>
-                    <option value="50">50x</option>
-                    <option value="100">100x</option>
-                  </select>
-                </label>
-                <span id="timeLabel" class="time-label"></span>
-              </div>
-            </section>
-            <section class="details">
-              <div class="card status-panel" id="statusPanel">
-                <div class="status-block">
-                  <span>Time</span>
-                  <div class="status-value" id="statusTime">–</div>
-                </div>
-                <div class="status-block">
-                  <span>Equity</span>
-                  <div class="status-value" id="statusEquity">–</div>
-                </div>
-                <div class="status-block">
-                  <span>BTC HODL</span>
-                  <div class="status-value" id="statusHodl">–</div>
-                </div>
-                <div class="status-block">
-                  <span>Last Trade</span>
-                  <div class="status-value" id="statusTrade">No trades yet</div>
-                </div>
-              </div>
-              <div class="card trade-card">
-                <h2 style="margin-top:0;">Timeline</h2>
-                <div class="trade-log" id="tradeLog"></div>
-              </div>
-            </section>
-          </main>
-
-
-          <script>
-            const portfolioPoints = {portfolio_payload};
-            const tradeEvents = {trade_payload};
-            const completedTrades = {completed_payload};
-            const ctx = document.getElementById('replayChart').getContext('2d');
-
-            const equityDataset = {{
-              type: 'line',
-              label: 'Equity',
-              data: [],
-              borderColor: '#00e6a8',
-              backgroundColor: 'rgba(0, 230, 168, 0.08)',
-              fill: true,
-              tension: 0.3,
-              pointRadius: 0,
-              borderWidth: 2
-            }};
-
-            const balanceDataset = {{
-              type: 'line',
-              label: 'Balance',
-              data: [],
-              borderColor: '#3b82f6',
-              backgroundColor: 'rgba(59,130,246,0.05)',
-              fill: false,
-              tension: 0.15,
-              pointRadius: 0,
-              borderWidth: 1.2,
-              borderDash: [6, 3]
-            }};
-
-            const hodlDataset = {{
-              type: 'line',
-              label: 'BTC HODL',
-              data: [],
-              borderColor: '#fbbf24',
-              backgroundColor: 'rgba(251,191,36,0.08)',
-              fill: false,
-              tension: 0.25,
-              pointRadius: 0,
-              borderWidth: 1.6,
-              borderDash: [3, 3]
-            }};
-
-            const tradesDataset = {{
-              type: 'scatter',
-              label: 'Trades',
-              data: [],
-              parsing: false,
-              pointRadius: ctx => ctx.raw?.action === 'CLOSE' ? 6 : 4,
-              pointHoverRadius: 8,
-              pointBackgroundColor: ctx => {{
-                if (!ctx.raw) return '#ffffff';
-                if (ctx.raw.action === 'ENTRY') return ctx.raw.side === 'LONG' ? '#22d3ee' : '#f97316';
-                return ctx.raw.pnl >= 0 ? '#00ff9d' : '#ff4d6d';
-              }},
-              pointBorderColor: 'rgba(0,0,0,0.6)',
-              pointBorderWidth: 1,
-            }};
-
-            const chart = new Chart(ctx, {{
-              data: {{
-                datasets: [equityDataset, balanceDataset, hodlDataset, tradesDataset]
-              }},
-              options: {{
-                responsive: true,
-                animation: false,
-                interaction: {{
-                  mode: 'nearest',
-                  intersect: false,
-                }},
-                scales: {{
-                  x: {{
-                    type: 'time',
-                    time: {{
-                      tooltipFormat: 'yyyy-MM-dd HH:mm'
-                    }},
-                    grid: {{
-                      color: 'rgba(255,255,255,0.05)'
-                    }},
-                    ticks: {{
-                      color: 'rgba(255,255,255,0.7)'
-                    }}
-                  }},
-                  y: {{
-                    title: {{
-                      display: true,
-                      text: 'USD'
-                    }},
-                    grid: {{
-                      color: 'rgba(255,255,255,0.05)'
-                    }},
-                    ticks: {{
-                      color: 'rgba(255,255,255,0.7)'
-                    }}
-                  }}
-                }},
-                plugins: {{
-                  legend: {{
-                    position: 'top',
-                    labels: {{
-                      usePointStyle: true,
-                    }}
-                  }},
-                  tooltip: {{
-                    callbacks: {{
-                      label: ctx => {{
-                        if (ctx.dataset.type === 'scatter') {{
-                          const raw = ctx.raw;
-                          return `${{raw.action}} ${{raw.coin}} @ ${{raw.price ?? '—'}} (PnL ${{formatUsd(raw.pnl)}})`;
-                        }}
-                        return `${{ctx.dataset.label}}: ${{formatUsd(ctx.parsed.y)}}`;
-                      }}
-                    }}
-                  }}
-                }}
-              }}
-            }});
-
-            const playButton = document.getElementById('playButton');
-            const frameSlider = document.getElementById('frameSlider');
-            const speedSelect = document.getElementById('speedSelect');
-            const timeLabel = document.getElementById('timeLabel');
-            const statusTime = document.getElementById('statusTime');
-            const statusEquity = document.getElementById('statusEquity');
-            const statusHodl = document.getElementById('statusHodl');
-            const statusTrade = document.getElementById('statusTrade');
-            const tradeLog = document.getElementById('tradeLog');
-
-            let currentFrame = 0;
-            let playing = false;
-            let rafId = null;
-            const maxFrame = Number(frameSlider.max);
-
-            const speeds = {{
-              1: 650,
-              2: 420,
-              4: 220,
-              8: 120,
-              10: 80,
-              50: 30,
-              100: 15
-            }};
-
-            function formatUsd(value) {{
-              if (value == null || isNaN(value)) return '—';
-              return Number(value).toLocaleString(undefined, {{ minimumFractionDigits: 2, maximumFractionDigits: 2 }});
-            }}
-
-            function formatUsdDisplay(value) {{
-              const formatted = formatUsd(value);
-              return formatted === '—' ? '—' : '$' + formatted;
-            }}
-
-            function formatTimestamp(value) {{
-              if (!value) return '—';
-              return new Date(value).toLocaleString();
-            }}
-
-            function formatDuration(seconds) {{
-              if (seconds == null || isNaN(seconds)) return '—';
-              const abs = Math.abs(seconds);
-              if (abs >= 86400) {{
-                return `${{(abs / 86400).toFixed(1)}} d`;
-              }}
-              if (abs >= 3600) {{
-                return `${{(abs / 3600).toFixed(1)}} h`;
-              }}
-              return `${{(abs / 60).toFixed(0)}} m`;
-            }}
-
-            function updateStatus(point, latestTrade) {{
-              statusTime.textContent = new Date(point.timestamp).toLocaleString();
-              statusEquity.textContent = formatUsdDisplay(point.equity ?? point.balance);
-              statusHodl.textContent = formatUsdDisplay(point.hodl_equity);
-              if (latestTrade) {{
-                const pnlStr = formatUsdDisplay(latestTrade.pnl);
-                const durationStr = formatDuration(latestTrade.duration_seconds);
-                statusTrade.innerHTML = `<strong>${{latestTrade.coin}} ${{latestTrade.side}}</strong><br><span class="status-meta">PnL ${{pnlStr}} · ${{durationStr}}</span>`;
-              }} else {{
-                statusTrade.textContent = 'No trades yet';
-              }}
-            }}
-
-            function renderTradeLog(latestTime) {{
-              const visible = completedTrades.filter(trade => {{
-                const marker = trade.exit_timestamp || trade.entry_timestamp;
-                return new Date(marker) <= latestTime;
-              }});
-              tradeLog.innerHTML = visible
-                .slice(-25)
-                .reverse()
-                .map(trade => {{
-                  const pnlClass = trade.pnl == null ? '' : (trade.pnl >= 0 ? 'pos' : 'neg');
-                  return `
-                    <div class="trade-item">
-                      <div>
-                        <div class="label">${{trade.coin}} ${{trade.side}}</div>
-                        <div class="meta">Entry ${{formatTimestamp(trade.entry_timestamp)}} @ ${{formatUsdDisplay(trade.entry_price)}}</div>
-                        <div class="meta">Exit ${{formatTimestamp(trade.exit_timestamp)}} @ ${{formatUsdDisplay(trade.exit_price)}} · Duration ${{formatDuration(trade.duration_seconds)}}</div>
-                      </div>
-                      <div class="pnl-value ${{pnlClass}}">${{formatUsdDisplay(trade.pnl)}}</div>
-                    </div>
-                  `;
-                }}).join('');
-            }}
-
-            function sliceSeries(frameIdx) {{
-              const segment = portfolioPoints.slice(0, frameIdx + 1);
-              equityDataset.data = segment
-                .filter(point => point.equity != null)
-                .map(point => ({{ x: point.timestamp, y: point.equity }}));
-              balanceDataset.data = segment
-                .filter(point => point.balance != null)
-                .map(point => ({{ x: point.timestamp, y: point.balance }}));
-              const cutoff = new Date(segment[segment.length - 1].timestamp);
-              hodlDataset.data = segment
-                .filter(point => point.hodl_equity != null)
-                .map(point => ({{ x: point.timestamp, y: point.hodl_equity }}));
-              tradesDataset.data = tradeEvents
-                .filter(evt => new Date(evt.timestamp) <= cutoff)
-                .map(evt => ({{ x: evt.timestamp, y: evt.plot_value, ...evt }}));
-              chart.update('none');
-              const latestTrade = (() => {{
-                for (let i = completedTrades.length - 1; i >= 0; i--) {{
-                  const trade = completedTrades[i];
-                  const marker = trade.exit_timestamp || trade.entry_timestamp;
-                  if (new Date(marker) <= cutoff) {{
-                    return trade;
-                  }}
-                }}
-                return null;
-              }})();
-              updateStatus(segment[segment.length - 1], latestTrade);
-              renderTradeLog(cutoff);
-              timeLabel.textContent = cutoff.toLocaleString();
-            }}
-
-            function step(timestamp) {{
-              if (!playing) return;
-              const delay = speeds[speedSelect.value] ?? speeds[1];
-              if (!step.lastTime || timestamp - step.lastTime >= delay) {{
-                currentFrame = Math.min(currentFrame + 1, maxFrame);
-                frameSlider.value = currentFrame;
-                sliceSeries(currentFrame);
-                step.lastTime = timestamp;
-                if (currentFrame === maxFrame) {{
-                  playing = false;
-                  playButton.textContent = 'Replay';
-                  return;
-                }}
-              }}
-              rafId = requestAnimationFrame(step);
-            }}
-
-            playButton.addEventListener('click', () => {{
-              if (playing) {{
-                playing = false;
-                playButton.textContent = 'Play';
-                if (rafId) cancelAnimationFrame(rafId);
-                return;
-              }}
-              if (currentFrame === maxFrame) {{
-                currentFrame = 0;
-                frameSlider.value = 0;
-                sliceSeries(0);
-              }}
-              playing = true;
-              playButton.textContent = 'Pause';
-              step.lastTime = null;
-              rafId = requestAnimationFrame(step);
-            }});
-
-            frameSlider.addEventListener('input', (event) => {{
-              currentFrame = Number(event.target.value);
-              sliceSeries(currentFrame);
-            }});
-
-            window.addEventListener('keydown', (event) => {{
-              if (event.code === 'Space') {{
-                event.preventDefault();
-                playButton.click();
-              }}
-            }});
-
-            sliceSeries(0);
-            renderTradeLog(new Date(portfolioPoints[0].timestamp));
-          </script>
-        </body>
-        </html>
-        """
-    )
+    # Payloads go straight into the output as the page is emitted, so no
+    # string ever holds the whole page with its data embedded.
+    payload_writers: Dict[str, Callable[[], object]] = {
+        "portfolio_payload": lambda: json.dump(
+            portfolio_series_payload(portfolio_points), handle, separators=(",", ":")
+        ),
+        "trade_payload": lambda: write_compressed_json_array(
+            handle, (trade.to_payload() for trade in trades)
+        ),
+        "trade_times": lambda: handle.write(
+            encode_array("d", (trade.epoch_us // 1000 for trade in trades))
+        ),
+        "trade_values": lambda: handle.write(
+            encode_array("d", usd_column(trade.plot_value for trade in trades))
+        ),
+        "completed_payload": lambda: write_compressed_json_array(
+            handle, (trade.to_payload() for trade in completed_trades)
+        ),
+        "completed_markers": lambda: handle.write(
+            encode_array("d", (trade.marker_us // 1000 for trade in completed_trades))
+        ),
+    }
+
+    fields = {
+        "data_label": data_label,
+        "final_equity": final_equity,
+        "net_return": net_return,
+        "hodl_equity": hodl_equity,
+        "hodl_return": hodl_return,
+        "alpha_display": alpha_display,
+        "total_trades_text": total_trades_text,
+        "win_rate": win_rate,
+        "max_dd_display": max_dd_display,
+        "runtime_text": runtime_text,
+        "max_frame": max_frame,
+    }
+
+    for idx, part in enumerate(TEMPLATE_PARTS):
+        if idx % 2:
+            payload_writers[part]()
+        else:
+            handle.write(part.substitute(fields))
 
 
 def main() -> None:
@@ -1160,17 +1721,22 @@ def main() -> None:
     if not data_dir.exists():
         raise SystemExit(f"Data directory {data_dir} does not exist.")
 
-    portfolio_records = load_records(data_dir / "portfolio_state")
-    trade_records = load_records(data_dir / "trade_history")
+    # The two artifacts are independent files; read them concurrently so the
+    # disk latency of one overlaps with the other.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        portfolio_future = executor.submit(load_columns, data_dir / "portfolio_state")
+        trade_future = executor.submit(load_columns, data_dir / "trade_history")
+        portfolio_columns = portfolio_future.result()
+        trade_columns = trade_future.result()
 
-    portfolio_points = build_portfolio_points(portfolio_records)
-    trades = build_trade_events(trade_records, portfolio_points)
+    portfolio_points = build_portfolio_points(portfolio_columns)
+    trades = build_trade_events(trade_columns, portfolio_points)
     completed_trades = pair_trade_events(trades)
     stats = compute_stats(portfolio_points, trades, completed_trades)
 
     data_label = data_dir.name or str(data_dir)
-    html = render_html(portfolio_points, trades, completed_trades, data_label, stats)
-    args.output.write_text(html, encoding="utf-8")
+    with args.output.open("w", encoding="utf-8") as handle:
+        write_html(handle, portfolio_points, trades, completed_trades, data_label, stats)
     print(f"Trade replay written to {args.output}")
 
 